@@ -20,6 +20,26 @@ SEP_COLS = " "
 SEP_CHROMS = " "
 COMMENT_CHAR = "#"
 
+# Non-standard column names and their .pairs-standard counterparts.
+_COLUMN_ALIASES = {
+    "chr1": "chrom1",
+    "chr2": "chrom2",
+    "pt": "pair_type",
+}
+
+# Pairs header keys that must be identical among merged files.
+_PAIRHEADER_KEYS_IDENTICAL = (
+    "## pairs format",
+    "#sorted:",
+    "#shape:",
+    "#genome_assembly:",
+    "#columns:",
+)
+# Pairs header keys that are handled explicitly when merging.
+_PAIRHEADER_KEYS_MERGED = _PAIRHEADER_KEYS_IDENTICAL + ("#chromosomes", "#chromsize")
+
+# Order of the fields of a formatted @PG record.
+_PG_FIELDS_ORDER = ("ID", "PN", "CL", "PP", "DS", "VN")
 
 
 def get_header(instream, comment_char=COMMENT_CHAR, ignore_warning=False):
@@ -95,13 +115,90 @@ def extract_fields(header, field_name, save_rest=False):
 def extract_column_names(header):
     """
     Extract column names from header lines.
+    Returns the names from the first "#columns:" line without scanning
+    the rest of the header, or an empty list if there is none.
     """
-    columns = extract_fields(header, "columns")
+    for l in header:
+        if l.lstrip(COMMENT_CHAR).startswith("columns:"):
+            return l.split(":", 1)[1].rstrip("\n").lstrip().split(SEP_COLS)
+    return []
+
+
+def extract_standardized_column_names(header):
+    """
+    Extract column names from header lines, converted to standard names.
+    """
+    return [_COLUMN_ALIASES.get(c, c) for c in extract_column_names(header)]
+
+
+def standardize_column(name):
+    """
+    Convert a column name to its standard .pairs name, e.g. "chr1" -> "chrom1".
+    Names without a known alias are returned unchanged.
+    """
+    return _COLUMN_ALIASES.get(name, name)
+
+
+def get_column_index(columns, spec):
+    """
+    Get the index of a column by its name or position.
 
-    if len(columns) != 0:
-        return columns[0].split(SEP_COLS)
+    Parameters
+    ----------
+    columns: list of column names
+    spec: str or int
+        Column name (standard or alias, e.g. "chr1") or integer position.
+
+    Returns
+    -------
+    Index of the first column named exactly spec or, if there is none, of
+    the first column with the same standardized name as spec. Negative
+    positions are converted to their non-negative counterparts.
+    """
+    if isinstance(spec, str):
+        std_spec = standardize_column(spec)
+        std_match = None
+        for i, c in enumerate(columns):
+            if c == spec:
+                return i
+            if std_match is None and standardize_column(c) == std_spec:
+                std_match = i
+        if std_match is not None:
+            return std_match
+        raise ValueError(f"Column {spec!r} not found in {columns}")
+    elif isinstance(spec, (int, np.integer)) and not isinstance(spec, bool):
+        i = int(spec)
+        if i < 0:
+            i += len(columns)
+        if not 0 <= i < len(columns):
+            raise IndexError(
+                f"Column index {spec} is out of range for {len(columns)} columns"
+            )
+        return i
     else:
-        return []
+        raise AttributeError("Column spec must be a string or an integer")
+
+
+def get_column_indices(columns, specs):
+    """
+    Get the indices of several columns by their names or positions.
+
+    Parameters
+    ----------
+    columns: list of column names
+    specs: iterable of str or int
+        Column names (standard or alias) or integer positions,
+        see get_column_index.
+
+    Returns
+    -------
+    np.ndarray of int32 indices of the columns, in the order of specs.
+    """
+    specs = list(specs)
+    indices = np.empty(len(specs), dtype=np.int32)
+    for k, spec in enumerate(specs):
+        indices[k] = get_column_index(columns, spec)
+    return indices
 
 
 def validate_cols(stream, columns):
@@ -268,8 +365,7 @@ def make_standard_pairsheader(
             chromsizes = chromsizes.items()
         except AttributeError:
             pass
-        for chrom, length in chromsizes:
-            header.append("#chromsize: {} {}".format(chrom, length))
+        header.extend(f"#chromsize: {chrom} {length}" for chrom, length in chromsizes)
 
     header.append("#columns: " + SEP_COLS.join(columns))
 
@@ -382,18 +478,13 @@ def _add_pg_to_samheader(samheader, ID="", PN="", VN=None, CL=None, force=False)
         CL = " ".join(sys.argv)
 
     pre_pg_header = [
-        line.strip()
-        for line in samheader
-        if line.startswith("@HD") or line.startswith("@SQ") or line.startswith("@RG")
+        line.strip() for line in samheader if line.startswith(("@HD", "@SQ", "@RG"))
     ]
 
     post_pg_header = [
         line.strip()
         for line in samheader
-        if not line.startswith("@HD")
-        and (not line.startswith("@SQ"))
-        and (not line.startswith("@RG"))
-        and (not line.startswith("@PG"))
+        if not line.startswith(("@HD", "@SQ", "@RG", "@PG"))
     ]
 
     pg_chains = _parse_pg_chains(samheader, force=force)
@@ -416,7 +507,7 @@ def _add_pg_to_samheader(samheader, ID="", PN="", VN=None, CL=None, force=False)
 def _format_pg(**kwargs):
     out = ["@PG"] + [
         "{}:{}".format(field, kwargs[field])
-        for field in ["ID", "PN", "CL", "PP", "DS", "VN"]
+        for field in _PG_FIELDS_ORDER
         if field in kwargs
     ]
     return "\t".join(out)
@@ -441,49 +532,39 @@ def _parse_pg_chains(header, force=False):
                 parsed_tvp["raw"] = l.strip()
                 parsed_pgs.append(parsed_tvp)
 
-    while True:
-        if len(parsed_pgs) == 0:
-            break
+    # indices of the chains, keyed by the ID of the last @PG in the chain
+    chains_by_tail_id = defaultdict(list)
+    for j, pg in enumerate(parsed_pgs):
+        if "PP" not in pg:
+            chain_idx = len(pg_chains)
+            pg_chains.append([pg])
+        else:
+            matching_chains = chains_by_tail_id.get(pg["PP"], [])
+            if len(matching_chains) > 1 and not force:
+                raise ParseError(
+                    "Multiple @PG records with the IDs identical to the PP field of another record:\n"
+                    + "\n".join(
+                        [pg_chains[k][-1]["raw"] for k in sorted(matching_chains)]
+                    )
+                    + "\nvs\n"
+                    + pg["raw"]
+                )
 
-        for i in range(len(parsed_pgs)):
-            pg = parsed_pgs[i]
-            if "PP" not in pg:
-                pg_chains.append([pg])
-                parsed_pgs.pop(i)
-                break
-            else:
-                matching_chains = [
-                    branch for branch in pg_chains if branch[-1]["ID"] == pg["PP"]
-                ]
-                if len(matching_chains) > 1:
-                    if force:
-                        matching_chains[0].append(pg)
-                        parsed_pgs.pop(i)
-                        break
-
-                    else:
-                        raise ParseError(
-                            "Multiple @PG records with the IDs identical to the PP field of another record:\n"
-                            + "\n".join([br[-1]["raw"] for br in matching_chains])
-                            + "\nvs\n"
-                            + pg["raw"]
-                        )
-
-                if len(matching_chains) == 1:
-                    matching_chains[0].append(pg)
-                    parsed_pgs.pop(i)
-                    break
-
-            if force:
+            if matching_chains:
+                chain_idx = min(matching_chains)
+                matching_chains.remove(chain_idx)
+                pg_chains[chain_idx].append(pg)
+            elif force:
+                chain_idx = len(pg_chains)
                 pg_chains.append([pg])
-                parsed_pgs.pop(i)
-                break
             else:
                 raise ParseError(
                     "Cannot find the parental @PG record for the @PG records:\n"
-                    + "\n".join([pg["raw"] for pg in parsed_pgs])
+                    + "\n".join([pg["raw"] for pg in parsed_pgs[j:]])
                 )
 
+        chains_by_tail_id[pg.get("ID")].append(chain_idx)
+
     return pg_chains
 
 
@@ -567,6 +648,15 @@ def merge_chrom_lists(*lsts):
     return chrom_list
 
 
+def _add_suffix_to_sam_tag(line, tag, suffix):
+    """Append suffix to the value of a TAG:VALUE field of a sam header line."""
+    head, sep, tail = line.partition("\t" + tag + ":")
+    if not sep:
+        return line
+    value, sep_next, rest = tail.partition("\t")
+    return head + sep + value + suffix + sep_next + rest
+
+
 def _merge_samheaders(samheaders, force=False):
     # first, append an HD line if it is present in any files
     # if different lines are present, raise an error
@@ -598,32 +688,21 @@ def _merge_samheaders(samheaders, force=False):
     # provided merging order
     PGs = []
     for i, samheader in enumerate(samheaders):
+        suffix = "-" + str(i + 1)
         for line in samheader:
             if line.startswith("@PG"):
-                split_line = line.split("\t")
-                for j in range(len(split_line)):
-                    if split_line[j].startswith("ID:") or split_line[j].startswith(
-                        "PP:"
-                    ):
-                        split_line[j] = split_line[j] + "-" + str(i + 1)
-                PGs.append("\t".join(split_line))
-
-    # finally, add all residual unique lines
-    rest = sum(
-        [
-            list(
-                set(
-                    line
-                    for line in samheader
-                    if (not line.startswith("@HD"))
-                    and (not line.startswith("@SQ"))
-                    and (not line.startswith("@PG"))
-                )
-            )
-            for samheader in samheaders
-        ],
-        [],
-    )
+                line = _add_suffix_to_sam_tag(line, "ID", suffix)
+                line = _add_suffix_to_sam_tag(line, "PP", suffix)
+                PGs.append(line)
+
+    # finally, add all residual unique lines, keeping their original order
+    rest = []
+    seen = set()
+    for line in itertools.chain.from_iterable(samheaders):
+        if line.startswith(("@HD", "@SQ", "@PG")) or line in seen:
+            continue
+        seen.add(line)
+        rest.append(line)
 
     new_header = []
     new_header += HDs
@@ -638,17 +717,9 @@ def _merge_pairheaders(pairheaders, force=False):
     new_header = []
 
     # first, add all keys that are expected to be the same among all headers
-    keys_expected_identical = [
-        "## pairs format",
-        "#sorted:",
-        "#shape:",
-        "#genome_assembly:",
-        "#columns:",
-    ]
-
-    keys_orginal = [l.split()[0] for header in pairheaders for l in header]
+    keys_orginal = {l.split()[0] for header in pairheaders for l in header}
 
-    for k in keys_expected_identical:
+    for k in _PAIRHEADER_KEYS_IDENTICAL:
         lines = [[l for l in header if l.startswith(k)] for header in pairheaders]
         same = all([l == lines[0] for l in lines])
         if not (same or force):
@@ -686,10 +757,7 @@ def _merge_pairheaders(pairheaders, force=False):
             l
             for h in pairheaders
             for l in h
-            if not any(
-                l.startswith(k)
-                for k in keys_expected_identical + ["#chromosomes", "#chromsize"]
-            )
+            if not l.startswith(_PAIRHEADER_KEYS_MERGED)
         )
     )
     if other_lines:
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from pairtools.lib import headerops
 
+import numpy as np
 import pytest
 
 
@@ -17,6 +18,13 @@ def test_make_standard_header():
 
     assert sum([l.startswith("#chromsize") for l in header]) == 3
 
+    header = headerops.make_standard_pairsheader(
+        assembly="hg38", shape="whole matrix", columns=["readID", "chrom1"]
+    )
+    assert "#genome_assembly: hg38" in header
+    assert "#shape: whole matrix" in header
+    assert header[-1] == "#columns: readID chrom1"
+
 
 def test_samheaderops():
     header = headerops.make_standard_pairsheader()
@@ -134,6 +142,39 @@ def test_merge_samheaders():
     ]
 
 
+def test_merge_samheaders_residual_lines():
+    headers = [
+        ["@HD\tVN:1", "@CO\tb", "@CO\ta"],
+        ["@HD\tVN:1", "@CO\ta", "@CO\tc"],
+    ]
+    merged_header = headerops._merge_samheaders(headers)
+    assert merged_header == ["@HD\tVN:1", "@CO\tb", "@CO\ta", "@CO\tc"]
+
+
+def test_merge_samheaders_pg_chains():
+    headers = [
+        [
+            "@PG\tID:bwa\tPN:bwa",
+            "@PG\tID:pairtools\tPN:pairtools\tPP:bwa",
+        ],
+        [
+            "@PG\tID:bwa\tPN:bwa",
+        ],
+        [
+            "@PG\tID:bwa\tPN:bwa",
+            "@PG\tID:pairtools\tPN:pairtools\tPP:bwa",
+        ],
+    ]
+    merged_header = headerops._merge_samheaders(headers)
+    assert merged_header == [
+        "@PG\tID:bwa-1\tPN:bwa",
+        "@PG\tID:pairtools-1\tPN:pairtools\tPP:bwa-1",
+        "@PG\tID:bwa-2\tPN:bwa",
+        "@PG\tID:bwa-3\tPN:bwa",
+        "@PG\tID:pairtools-3\tPN:pairtools\tPP:bwa-3",
+    ]
+
+
 def test_merge_headers():
     headers = [
         [
@@ -146,3 +187,122 @@ def test_merge_headers():
 
     merged_header = headerops.merge_headers(headers)
     assert merged_header == headers[0]
+
+
+def test_standardize_column():
+    assert headerops.standardize_column("chr1") == "chrom1"
+    assert headerops.standardize_column("chr2") == "chrom2"
+    assert headerops.standardize_column("pt") == "pair_type"
+    assert headerops.standardize_column("chrom1") == "chrom1"
+    assert headerops.standardize_column("readID") == "readID"
+
+
+def test_get_column_index():
+    columns = ["readID", "chr1", "pos1", "chrom2", "pos2", "pair_type"]
+    assert headerops.get_column_index(columns, "readID") == 0
+    assert headerops.get_column_index(columns, "chr1") == 1
+    assert headerops.get_column_index(columns, "chrom1") == 1
+    assert headerops.get_column_index(columns, "chr2") == 3
+    assert headerops.get_column_index(columns, "pt") == 5
+    assert headerops.get_column_index(columns, 2) == 2
+
+    # exact names take precedence over standardized ones
+    columns = ["readID", "chr1", "chrom1", "pt"]
+    assert headerops.get_column_index(columns, "chr1") == 1
+    assert headerops.get_column_index(columns, "chrom1") == 2
+    assert headerops.get_column_index(columns, "pair_type") == 3
+
+    with pytest.raises(ValueError):
+        headerops.get_column_index(columns, "strand1")
+    with pytest.raises(IndexError):
+        headerops.get_column_index(columns, 10)
+
+
+def test_integration_with_extract_column_names():
+    header = [
+        "## pairs format v1.0",
+        "#shape: upper triangle",
+        "#columns: readID chr1 pos1 chr2 pos2 pt",
+        "#chromsize: chr1 100",
+    ]
+    columns = headerops.extract_column_names(header)
+    assert columns == ["readID", "chr1", "pos1", "chr2", "pos2", "pt"]
+
+    std_columns = headerops.extract_standardized_column_names(header)
+    assert std_columns == [headerops.standardize_column(c) for c in columns]
+    assert std_columns == ["readID", "chrom1", "pos1", "chrom2", "pos2", "pair_type"]
+
+    assert headerops.get_column_index(columns, "chrom2") == 3
+    assert headerops.get_column_index(std_columns, "pt") == 5
+
+
+def test_edge_cases():
+    columns = ["chrom1", "pos1", "chrom2"]
+    assert headerops.get_column_index(columns, -1) == 2
+    assert headerops.get_column_index(columns, -3) == 0
+    assert headerops.get_column_index(columns, np.int64(1)) == 1
+    assert headerops.get_column_index(columns, np.int32(-1)) == 2
+
+    with pytest.raises(IndexError):
+        headerops.get_column_index(columns, -4)
+    with pytest.raises(AttributeError):
+        headerops.get_column_index(columns, 3.14)
+    with pytest.raises(AttributeError):
+        headerops.get_column_index(columns, True)
+    with pytest.raises(ValueError):
+        headerops.get_column_index([], "chrom1")
+
+
+def test_get_column_indices():
+    columns = ["readID", "chr1", "pos1", "chrom2", "pos2", "pair_type"]
+    indices = headerops.get_column_indices(columns, ["chrom1", "chr2", "pt", -1, 0])
+    assert indices.dtype == np.int32
+    assert indices.tolist() == [1, 3, 5, 5, 0]
+
+    indices = headerops.get_column_indices(columns, (c for c in ["pos2", "chr1"]))
+    assert indices.tolist() == [4, 1]
+
+    with pytest.raises(ValueError):
+        headerops.get_column_indices(columns, ["pos1", "strand1"])
+
+
+def test_parse_pg_chains():
+    def chain_ids(pg_chains):
+        return [[pg["ID"] for pg in chain] for chain in pg_chains]
+
+    samheader = [
+        "@PG\tID:a\tPN:a",
+        "@PG\tID:b\tPN:b\tPP:a",
+        "@PG\tID:x\tPN:x",
+        "@PG\tID:c\tPN:c\tPP:b",
+    ]
+    pg_chains = headerops._parse_pg_chains(samheader)
+    assert chain_ids(pg_chains) == [["a", "b", "c"], ["x"]]
+
+    # two chains end with the same ID, so the parent of "b" is ambiguous
+    samheader = [
+        "@PG\tID:a\tPN:a",
+        "@PG\tID:a\tPN:a",
+        "@PG\tID:b\tPN:b\tPP:a",
+    ]
+    with pytest.raises(headerops.ParseError, match="Multiple @PG records"):
+        headerops._parse_pg_chains(samheader)
+    # with force, the earliest matching chain is extended
+    pg_chains = headerops._parse_pg_chains(samheader, force=True)
+    assert chain_ids(pg_chains) == [["a", "b"], ["a"]]
+
+    # the parent of "b" is missing
+    samheader = [
+        "@PG\tID:a\tPN:a",
+        "@PG\tID:b\tPN:b\tPP:missing",
+        "@PG\tID:c\tPN:c\tPP:b",
+    ]
+    with pytest.raises(headerops.ParseError) as exc_info:
+        headerops._parse_pg_chains(samheader)
+    message = str(exc_info.value)
+    assert message.startswith("Cannot find the parental @PG record")
+    assert samheader[1] in message and samheader[2] in message
+    assert samheader[0] not in message
+    # with force, the orphan record starts a new chain
+    pg_chains = headerops._parse_pg_chains(samheader, force=True)
+    assert chain_ids(pg_chains) == [["a"], ["b", "c"]]